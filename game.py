@@ -1,20 +1,190 @@
 import random
 import time
-import copy
+
+# Boards are kept as a pair of 25-bit ints, one per player, where bit
+# row*5+col is set when that player has a piece on (row, col).
+BOARD_MASK = (1 << 25) - 1
+
+
+def _bit(row, col):
+    """ Returns the bitboard bit of the (row, col) space """
+    return 1 << (row*5 + col)
+
+
+def _line_masks():
+    """ Builds the mask of every winning line of 4: rows, columns and both diagonals """
+    lines = []
+
+    # horizontal and vertical lines
+    for row in range(5):
+        for i in range(2):
+            lines.append(sum(_bit(row, i+k) for k in range(4)))
+    for col in range(5):
+        for i in range(2):
+            lines.append(sum(_bit(i+k, col) for k in range(4)))
+
+    # \ and / diagonals
+    for row in range(2):
+        for col in range(2):
+            lines.append(sum(_bit(row+k, col+k) for k in range(4)))
+    for row in range(2):
+        for col in range(2):
+            lines.append(sum(_bit(row+k, 4-col-k) for k in range(4)))
+
+    return tuple(lines)
+
+
+def _square_masks():
+    """ Builds a (corners, center) mask pair for every 3x3 square, which is a win for
+    whoever owns all of its corners as long as its center is empty
+    """
+    squares = []
+    for row in range(3):
+        for col in range(3):
+            corners = _bit(row, col) | _bit(row, col+2) | _bit(row+2, col) | _bit(row+2, col+2)
+            squares.append((corners, _bit(row+1, col+1)))
+
+    return tuple(squares)
+
+
+def _neighbor_mask(sq):
+    """ Returns the mask of the spaces adjacent to sq, without wrapping around edges """
+    row, col = divmod(sq, 5)
+    mask = 0
+    for i in range(-1, 2):
+        for j in range(-1, 2):
+            if (i != 0 or j != 0) and 0 <= row+i < 5 and 0 <= col+j < 5:
+                mask |= _bit(row+i, col+j)
+    return mask
+
+
+def _lanes(masks):
+    """ Packs a sequence of 25-bit masks into one int, one 26-bit lane per mask """
+    return sum(mask << (26*k) for k, mask in enumerate(masks))
+
+
+def _symmetries():
+    """ Returns the 8 symmetries of the board (rotations and reflections), each as a
+    tuple mapping a space to its image, the identity first
+    """
+    symmetries = []
+    for flip in (False, True):
+        for turns in range(4):
+            perm = []
+            for sq in range(25):
+                row, col = divmod(sq, 5)
+                if flip:
+                    col = 4-col
+                for _ in range(turns):
+                    row, col = col, 4-row
+                perm.append(row*5 + col)
+            symmetries.append(tuple(perm))
+
+    return tuple(symmetries)
+
+
+def _chunk_tables(values):
+    """ Builds lookup tables that sum a value per set bit of a packed board
+    (my_bb | opp_bb << 25) 10 bits at a time: table k maps bits 10k to 10k+9 of the
+    board to the sum of the values of the bits that are set
+    """
+    tables = []
+    for k in range(5):
+        table = []
+        for chunk in range(1 << 10):
+            total = 0
+            for i in range(10):
+                if chunk >> i & 1:
+                    total += values[10*k + i]
+            table.append(total)
+        tables.append(tuple(table))
+
+    return tuple(tables)
+
+
+def _symmetry_tables(perm):
+    """ Builds the _chunk_tables applying a symmetry to a packed board, each bit being
+    mapped to the bit of its image
+    """
+    return _chunk_tables([1 << (perm[b % 25] + 25*(b // 25)) for b in range(50)])
+
+
+def canonical(my_bb, opp_bb):
+    """ Returns the same key for a board and all its rotations and reflections: the
+    smallest packed board (my_bb | opp_bb << 25) among them
+    """
+    board = my_bb | opp_bb << 25
+    key = board
+    for t0, t1, t2, t3, t4 in SYMMETRY_TABLES:
+        image = t0[board & 1023] | t1[board >> 10 & 1023] | t2[board >> 20 & 1023] | t3[board >> 30 & 1023] | t4[board >> 40]
+        if image < key:
+            key = image
+
+    return key
+
+
+def _popcount(bb):
+    """ Returns the number of pieces on a bitboard """
+    return bin(bb).count('1')
+
+
+LINE_MASKS = _line_masks()
+SQUARE_MASKS = _square_masks()
+NEIGHBOR = tuple(_neighbor_mask(sq) for sq in range(25))
+SPACES = tuple(divmod(sq, 5) for sq in range(25))
+
+# lookup tables of the 7 symmetries other than the identity, for canonical()
+SYMMETRY_TABLES = tuple(_symmetry_tables(perm) for perm in _symmetries()[1:])
+
+# game_value tests all 37 winning configurations at once on a board copied into every
+# lane of a packed int (multiplying by REPLICATE). Each lane is 25 bits of board plus
+# a guard bit, which adding LANE_FULL sets in exactly the lanes that aren't all zero.
+REPLICATE = _lanes((1,) * (len(LINE_MASKS) + len(SQUARE_MASKS)))
+WIN_PIECES = _lanes(LINE_MASKS + tuple(corners for corners, _ in SQUARE_MASKS))
+WIN_CENTERS = _lanes((0,) * len(LINE_MASKS) + tuple(center for _, center in SQUARE_MASKS))
+LANE_FULL = BOARD_MASK * REPLICATE
+GUARDS = (BOARD_MASK + 1) * REPLICATE
+
+# heuristic_game_value scores a piece CENTER_WEIGHT on the center, twice that on the
+# inner ring and four times that on the edge (see its docstring). SPACE_WEIGHT holds
+# those multiples per space. succ scores moves with them too, so the search tries the moves
+# the heuristic likes best first and alpha-beta can cut off sooner. HEURISTIC_TABLES add
+# them up for a packed board, positive for the ai and negative for the opponent.
+CENTER_WEIGHT = 0.05
+SPACE_WEIGHT = tuple(1 << max(abs(sq//5 - 2), abs(sq%5 - 2)) for sq in range(25))
+HEURISTIC_TABLES = _chunk_tables([SPACE_WEIGHT[b % 25] * (1 if b < 25 else -1) for b in range(50)])
+
+# transposition table bound flags: the stored value is the exact score of the state, a
+# lower bound on it (the search failed high) or an upper bound on it (it failed low)
+EXACT, LOWER, UPPER = 0, 1, 2
+
+# seconds make_move may spend searching, and how many iterations it deepens to at most
+TIME_BUDGET = 2.0
+MAX_DEPTH = 8
+
+# how many game_value results make_move lets pile up before clearing them
+GV_CACHE_SIZE = 200000
+
+
+class SearchTimeout(Exception):
+    """ Raised from inside the search once make_move's time budget is spent """
+
 
 class Teeko2Player:
     """ An object representation for an AI game player for the game Teeko2.
     """
-    board = [[' ' for j in range(5)] for i in range(5)]
     pieces = ['b', 'r']
-    drop_phase_check = 0
 
     def __init__(self):
         """ Initializes a Teeko2Player object by randomly selecting red or black as its
         piece color.
         """
+        self.board = [[' ' for j in range(5)] for i in range(5)]
         self.my_piece = random.choice(self.pieces)
         self.opp = self.pieces[0] if self.my_piece == self.pieces[1] else self.pieces[1]
+        self.tt = {}
+        self.gv_cache = {}
+        self.deadline = float('inf')
 
     def make_move(self, state):
         """ Selects a (row, col) space for the next move. You may assume that whenever
@@ -42,22 +212,109 @@ class Teeko2Player:
             and will eventually take over the board. This is not a valid strategy and
             will earn you no points.
         """
-        self.drop_phase_check += 2
-        if self.my_piece == 'b' and self.drop_phase_check == 2:
-            self.drop_phase_check -= 1
+        # only keep one move's worth of searched states around. Game values don't depend
+        # on the move, so they are kept until there are too many of them.
+        self.tt = {}
+        if len(self.gv_cache) > GV_CACHE_SIZE:
+            self.gv_cache = {}
+
+        my_bb, opp_bb = self.to_bitboards(state)
+        # moves leading to boards that are rotations or reflections of each other score
+        # the same, so only the first (best weighted) of each is searched
+        successors = []
+        seen = set()
+        for successor in sorted(self.succ(my_bb, opp_bb), key=lambda s: s[1], reverse=True):
+            key = canonical(my_bb ^ successor[0], opp_bb)
+            if key not in seen:
+                seen.add(key)
+                successors.append(successor)
+        best_delta = successors[0][0]
+
+        # iterative deepening: search one ply deeper each time until the time budget runs
+        # out, keeping the move of the last search that completed. Each search tries the
+        # previous best move first and reuses the transposition table of the ones before.
+        self.deadline = time.time() + TIME_BUDGET
+        try:
+            for depth in range(MAX_DEPTH):
+                successors.sort(key=lambda s: (s[0] == best_delta, s[1]), reverse=True)
+                try:
+                    delta, val = self.search_root(my_bb, opp_bb, successors, depth)
+                except SearchTimeout:
+                    break
+
+                best_delta = delta
+                if abs(val) == 1:
+                    break # the game is decided within this depth, deeper won't change it
+        finally:
+            # the search is only timed while make_move runs
+            self.deadline = float('inf')
+
+        return self.delta_to_move(my_bb, best_delta)
+
+    def search_root(self, my_bb, opp_bb, successors, depth):
+        """Searches every root move to the given depth
+
+        Args:
+            my_bb, opp_bb (int): bitboards of the current state in game, ai about to play
+            successors (list): the (delta, score) root moves yielded by succ, in the order
+                to search them
+            depth: how deep to search below each root move
+
+        return: (delta, val) of the best root move and its score
+        """
+        best_delta = successors[0][0]
+        best_val = self.min_value(my_bb ^ best_delta, opp_bb, depth, -1000, 1000)
+
+        # the best score so far is a lower bound for the remaining moves
+        for delta, _ in successors[1:]:
+            val = self.min_value(my_bb ^ delta, opp_bb, depth, best_val, 1000)
+            if val > best_val:
+                best_delta = delta
+                best_val = val
+
+        return best_delta, best_val
+
+    def to_bitboards(self, state):
+        """ Converts a board state into the bitboard pair the search works on
+
+        Args:
+            state (list of lists): the current state of the game as saved in this
+                Teeko2Player object.
+
+        return:
+            (my_bb, opp_bb): the bitboards of this player's and the opponent's pieces
+        """
+        my_bb = 0
+        opp_bb = 0
+        for row in range(5):
+            for col in range(5):
+                if state[row][col] == self.my_piece:
+                    my_bb |= _bit(row, col)
+                elif state[row][col] == self.opp:
+                    opp_bb |= _bit(row, col)
 
-        successors = self.succ(state, self.my_piece)
-        best_move, best_successor = successors[0]
+        return my_bb, opp_bb
 
-        for move, successor in successors:
-            if self.min_value(successor, 2, -1000, 1000) > self.min_value(best_successor, 2, -1000, 1000):
-                best_move = move
-                best_successor = successor
+    def delta_to_move(self, turn_bb, delta):
+        """ Converts a move XOR delta yielded by succ into a move list
 
-        return best_move
+        Args:
+            turn_bb (int): bitboard of the pieces of whoever's turn it is, before the move
+            delta (int): the bits to XOR into turn_bb
+
+        return:
+            move (list): a list of move tuples as described in make_move
+        """
+        source = delta & turn_bb
+        dest = delta ^ source
+        move = [SPACES[dest.bit_length()-1]]
+        if source:
+            move.append(SPACES[source.bit_length()-1])
 
-    def succ(self, state, turn_piece):
-        """Takes in a board state and returns a list of the legal successors. 
+        return move
+
+    def succ(self, turn_bb, other_bb):
+        """Takes in a board state and yields its legal successors. 
         
         During the drop phase, this simply means adding a new piece of the current player's type to 
         the board; during continued gameplay, this means moving any one of the current player's 
@@ -66,44 +323,84 @@ class Teeko2Player:
         Note: wrapping around the edge is NOT allowed when determining "adjacent" positions.
 
         Args:
-            state (list of lists): should be the current state of the game as saved in
-                this Teeko2Player object.
-            turn_piece ('r' or 'b'): whose turn it is
+            turn_bb (int): bitboard of the pieces of whoever's turn it is
+            other_bb (int): bitboard of the other player's pieces, which never change
 
-        return: 
-            successors (list of lists): each list contains a move list (as described in make_move) and a successor state
+        Successors are neither built as new boards nor as move lists: each move is yielded as
+        the bits that have to be XORed into turn_bb to make it (XORing them again undoes it),
+        and delta_to_move turns the one make_move picks into a move list.
+
+        yields: 
+            (delta, score): the move's XOR delta for turn_bb and how much it adds to the moving
+                player's SPACE_WEIGHT total, to order the search by
         """
-        successors = []
+        empties = ~(turn_bb | other_bb) & BOARD_MASK
 
-        if self.drop_phase_check < 9:
-            
-            for row in range (5):
-                for col in range (5):
+        # every player drops 4 pieces, whichever turn the search is at
+        if _popcount(turn_bb) < 4:
 
-                    if state[row][col] == ' ':
-                        new_state = copy.deepcopy(state)
-                        new_state[row][col] = turn_piece
-                        successors.append([[(row, col)], new_state])
+            while empties:
+                dest = empties & -empties
+                empties ^= dest
+                yield dest, SPACE_WEIGHT[dest.bit_length()-1]
 
-            return successors
+        else:
+            pieces = turn_bb
+            while pieces:
+                source = pieces & -pieces
+                pieces ^= source
+                source_sq = source.bit_length()-1
+                source_weight = SPACE_WEIGHT[source_sq]
+
+                dests = NEIGHBOR[source_sq] & empties
+                while dests:
+                    dest = dests & -dests
+                    dests ^= dest
+                    yield source | dest, SPACE_WEIGHT[dest.bit_length()-1] - source_weight
+
+    def ordered_succ(self, turn_bb, other_bb, first_delta):
+        """Yields the XOR deltas of the legal successors in the order to search them: the
+        best move from the transposition table first, then the rest by succ's score.
+
+        The rest are only generated and sorted once the first one has been searched without
+        a cutoff, so nodes that cut off on the table move never build their successors.
 
+        Args:
+            turn_bb (int): bitboard of the pieces of whoever's turn it is
+            other_bb (int): bitboard of the other player's pieces
+            first_delta (int): the table's best move for the state, or None. It may come from
+                a rotation or reflection of the state, so it is only used if it is legal here.
+        """
+        if first_delta is not None and self.is_legal(turn_bb, other_bb, first_delta):
+            yield first_delta
         else:
-            for row in range (5):
-                for col in range (5):
+            first_delta = None
 
-                    if state[row][col] == turn_piece:
+        for delta, _ in sorted(self.succ(turn_bb, other_bb), key=lambda s: s[1], reverse=True):
+            if delta != first_delta:
+                yield delta
 
-                        for i in range(-1, 2):
-                            for j in range(-1, 2):
-                                if (i != 0 or j != 0) and (row+i in range(5)) and (col+j in range(5)) and state[row+i][col+j] == ' ':
-                                    new_state = copy.deepcopy(state)
-                                    new_state[row+i][col+j] = turn_piece
-                                    new_state[row][col] = ' '
-                                    successors.append([[(row+i, col+j), (row, col)], new_state])
+    def is_legal(self, turn_bb, other_bb, delta):
+        """Checks whether a move XOR delta is one of the legal successors yielded by succ
 
-            return successors
+        Args:
+            turn_bb (int): bitboard of the pieces of whoever's turn it is
+            other_bb (int): bitboard of the other player's pieces
+            delta (int): the bits to XOR into turn_bb
 
-    def max_value(self, state, depth, alpha, beta):
+        return: True if the move is legal
+        """
+        source = delta & turn_bb
+        dest = delta ^ source
+        if not dest or dest & (dest-1) or dest & other_bb:
+            return False # must land on exactly one empty space
+
+        if _popcount(turn_bb) < 4:
+            return not source
+
+        return bool(source) and not source & (source-1) and bool(NEIGHBOR[source.bit_length()-1] & dest)
+
+    def max_value(self, my_bb, opp_bb, depth, alpha, beta):
         """Your first call will be  max_value(self, curr_state, 0) and every subsequent recursive 
         call will increase the value of depth.
 
@@ -111,56 +408,104 @@ class Teeko2Player:
         terminate the recursion.
 
         Args:
-            state (list of lists): current state in game, ai about to play
+            my_bb, opp_bb (int): bitboards of the current state in game, ai about to play
             depth: an upper bound on search depth
             alpha: best score (highest) for Max along path to state
             beta: best score (lowest) for Min along path to state
         
         return: min(beta, best-score (for Max) available from state)
         """
-        terminal_val = self.game_value(state)
+        terminal_val = self.game_value(my_bb, opp_bb)
         if(terminal_val != 0):
             return terminal_val
 
         elif depth == 0:
-            return self.heuristic_game_value(state)
-
-        else:
-            successors = self.succ(state, self.my_piece)
-            for move, successor in successors:
-                alpha = max(alpha, self.min_value(successor, depth-1, alpha, beta))
+            return self.heuristic_game_value(my_bb, opp_bb)
+
+        if time.time() > self.deadline:
+            raise SearchTimeout()
+
+        key = (canonical(my_bb, opp_bb), True)
+        val, tt_delta = self.tt_lookup(key, depth, alpha, beta)
+        if val is not None:
+            return val
+
+        best_delta = None
+        for delta in self.ordered_succ(my_bb, opp_bb, tt_delta):
+            val = self.min_value(my_bb ^ delta, opp_bb, depth-1, alpha, beta)
+            if val > alpha:
+                alpha = val
+                best_delta = delta
                 if alpha>=beta:
+                    self.tt[key] = (depth, beta, LOWER, delta)
                     return beta
-        
+
+        self.tt[key] = (depth, alpha, UPPER if best_delta is None else EXACT, best_delta)
         return alpha
 
-    def min_value(self, state, depth, alpha, beta):
+    def min_value(self, my_bb, opp_bb, depth, alpha, beta):
         """
         Args:
-            state (list of lists): current state in game, opponent about to play
+            my_bb, opp_bb (int): bitboards of the current state in game, opponent about to play
             depth: an upper bound on search depth
             alpha: best score (highest) for Max along path to state
             beta: best score (lowest) for Min along path to state
 
         return: max(α , best-score (for Min) available from state)
         """
-        terminal_val = self.game_value(state)
+        terminal_val = self.game_value(my_bb, opp_bb)
         if(terminal_val != 0):
             return terminal_val
         
         elif depth == 0:
-            return self.heuristic_game_value(state)
-
-        else:
-            successors = self.succ(state, self.opp)
-            for move, successor in successors:
-                beta = min(beta, self.max_value(state, depth-1, alpha, beta))
+            return self.heuristic_game_value(my_bb, opp_bb)
+
+        if time.time() > self.deadline:
+            raise SearchTimeout()
+
+        key = (canonical(my_bb, opp_bb), False)
+        val, tt_delta = self.tt_lookup(key, depth, alpha, beta)
+        if val is not None:
+            return val
+
+        best_delta = None
+        for delta in self.ordered_succ(opp_bb, my_bb, tt_delta):
+            val = self.max_value(my_bb, opp_bb ^ delta, depth-1, alpha, beta)
+            if val < beta:
+                beta = val
+                best_delta = delta
                 if alpha>=beta:
+                    self.tt[key] = (depth, alpha, UPPER, delta)
                     return alpha
 
+        self.tt[key] = (depth, beta, LOWER if best_delta is None else EXACT, best_delta)
         return beta
 
-    def heuristic_game_value(self, state):
+    def tt_lookup(self, key, depth, alpha, beta):
+        """Looks up a state in the transposition table
+
+        Args:
+            key (tuple): (canonical() of the state, whether it is the ai's turn)
+            depth: the depth the state is about to be searched to
+            alpha: best score (highest) for Max along path to state
+            beta: best score (lowest) for Min along path to state
+
+        return:
+            (val, best_delta): val is the score to return for the state if the stored result,
+                searched at least as deep, settles it within (alpha, beta), otherwise None;
+                best_delta is the best move delta found for the state so far, if any
+        """
+        entry = self.tt.get(key)
+        if entry is None:
+            return None, None
+
+        entry_depth, val, flag, best_delta = entry
+        if entry_depth >= depth and (flag == EXACT or (flag == LOWER and val >= beta) or (flag == UPPER and val <= alpha)):
+            return min(max(val, alpha), beta), best_delta
+
+        return None, best_delta
+
+    def heuristic_game_value(self, my_bb, opp_bb):
         """Evaluates non-terminal states. 
 
         (You should call the game_value method from this function to determine whether the state is a terminal 
@@ -168,45 +513,23 @@ class Teeko2Player:
 
         This function should return some floating-point value between 1 and -1.
 
-        TODO: this a very stupid strategy to test all other functions <3
+        Every piece on the board scores the weight of its space, positive for this player's
+        pieces and negative for the opponent's, with weights :
+        0.2, 0.2, 0.2, 0.2, 0.2
+        0.2, 0.1, 0.1, 0.1, 0.2
+        0.2, 0.1, 0.05, 0.1, 0.2
+        0.2, 0.1, 0.1, 0.1, 0.2
+        0.2, 0.2, 0.2, 0.2, 0.2
 
-        Let weights be :
-        c, c, c, c, c
-        c, b, b, b, c
-        c, b, a, b, c
-        c, b, b, b, c
-        c, c, c, c, c
-
-        where, depending on whose piece is in the spot,
-        c = 0.05 or -0.05
-        b = 0.1 or -0.1
-        a = 0.2 or -0.2
+        The sum over the board is looked up in HEURISTIC_TABLES rather than added up here.
 
         Args:
-            state (list of lists): should be the current state of the game as saved in
-                this Teeko2Player object.
+            my_bb, opp_bb (int): bitboards of this player's and the opponent's pieces
         """
-        heuristic_val = 0
-
-        if self.drop_phase_check<3:
-            a = 0.05
-            b = 0.1
-            c = 0.2
-            weight = [[c, c, c, c, c],
-            [c, b, b, b, c],
-            [c, b, a, b, c],
-            [c, b, b, b, c],
-            [c, c, c, c, c]
-            ]
-
-            for row in range(5):
-                for col in range(5):
-                    if state[row][col] == self.my_piece:
-                        heuristic_val += weight[row][col]
-                    elif state[row][col] == self.opp:
-                        heuristic_val -= weight[row][col]
-
-        return heuristic_val
+        board = my_bb | opp_bb << 25
+        t0, t1, t2, t3, t4 = HEURISTIC_TABLES
+        return CENTER_WEIGHT * (t0[board & 1023] + t1[board >> 10 & 1023] + t2[board >> 20 & 1023]
+            + t3[board >> 30 & 1023] + t4[board >> 40])
 
     def opponent_move(self, move):
         """ Validates the opponent's next move against the internal board representation.
@@ -265,46 +588,34 @@ class Teeko2Player:
             print(line)
         print("   A B C D E")
 
-    def game_value(self, state):
+    def game_value(self, my_bb, opp_bb):
         """ Checks the current board status for a win condition
 
         Args:
-        state (list of lists): either the current state of the game as saved in
-            this Teeko2Player object, or a generated successor state.
+        my_bb, opp_bb (int): bitboards of this player's and the opponent's pieces, either
+            for the current state of the game or for a generated successor state.
 
         Returns:
             int: 1 if this Teeko2Player wins, -1 if the opponent wins, 0 if no winner
         """
-        # check horizontal wins
-        for row in state:
-            for i in range(2):
-                if row[i] != ' ' and row[i] == row[i+1] == row[i+2] == row[i+3]:
-                    return 1 if row[i]==self.my_piece else -1
-
-        # check vertical wins
-        for col in range(5):
-            for i in range(2):
-                if state[i][col] != ' ' and state[i][col] == state[i+1][col] == state[i+2][col] == state[i+3][col]:
-                    return 1 if state[i][col]==self.my_piece else -1
-
-        # check \ diagonal wins
-        for row in range (2):
-            for col in range (2):
-                if state[row][col] != ' ' and state[row][col] == state[row+1][col+1] == state[row+2][col+2] == state[row+3][col+3]:
-                    return 1 if state[row][col]==self.my_piece else -1
-        
-        # check / diagonal wins
-        for row in range (2):
-            for col in range (2):
-                if state[row][4-col] != ' ' and state[row][4-col] == state[row+1][3-col] == state[row+2][2-col] == state[row+3][1-col]:
-                    return 1 if state[row][4-col]==self.my_piece else -1
-
-        # check 3x3 square corners wins
-        for row in range (3):
-            for col in range (3):
-                if state[row][col] != ' ' and state[row+1][col+1] == ' ' and state[row][col] == state[row][col+2] == state[row+2][col] == state[row+2][col+2]:
-                    return 1 if state[row][col]==self.my_piece else -1
-
-
-        return 0 # no winner yet
-
+        key = my_bb | opp_bb << 25
+        val = self.gv_cache.get(key)
+        if val is not None:
+            return val
+
+        # a lane ends up all zero when the player has every piece of its configuration
+        # and its center (if any) is empty; that lane then keeps its guard bit clear
+        blocked = ((my_bb | opp_bb) * REPLICATE) & WIN_CENTERS
+
+        missing = (((my_bb * REPLICATE) & WIN_PIECES) ^ WIN_PIECES) | blocked
+        if ((missing + LANE_FULL) & GUARDS) != GUARDS:
+            val = 1
+        else:
+            missing = (((opp_bb * REPLICATE) & WIN_PIECES) ^ WIN_PIECES) | blocked
+            if ((missing + LANE_FULL) & GUARDS) != GUARDS:
+                val = -1
+            else:
+                val = 0 # no winner yet
+
+        self.gv_cache[key] = val
+        return val